@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+粒子群最適化の経過を画面を使わずに動画(GIF, MP4)として保存するクラス
+等高線は一度だけ描画して背景として使い回し、各フレームでは粒子だけを描く
+フレームの描画は複数のプロセスで分担する
+"""
+
+__author__ = "Hidemasa Kondo (C.A.C.)"
+__date__ = "created at 2026/10/19"
+__version__ = "1.0.0"
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import GifImagePlugin, Image
+
+from function_2d import Function2D
+
+FRAME_NAME: str = "frame_%07d.png"  # フレーム画像のファイル名
+
+# 描画用のプロセスごとに一つだけ作る状態
+_worker: Dict[str, object] = {}
+
+
+def _init_worker(
+    contour: List[np.ndarray],
+    domain: Tuple[Tuple[float, float], Tuple[float, float]],
+    best: Tuple[float, float],
+    x_point: np.ndarray,
+    y_point: np.ndarray,
+    size: Tuple[float, float],
+    dpi: int,
+) -> None:
+    """
+    描画用のプロセスを初期化する
+    等高線と最適解を描いた背景をここで一度だけ作成する
+    """
+    # pylint: disable=too-many-arguments
+    figure = Figure(figsize=size, dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+    axes = figure.add_subplot(111)
+    axes.contourf(*contour, cmap="Blues", levels=15)
+    axes.set_xlim(*domain[0])
+    axes.set_ylim(*domain[1])
+    axes.scatter(best[0], best[1], c="gray")
+    canvas.draw()
+
+    _worker["canvas"] = canvas
+    _worker["axes"] = axes
+    # 枠の外にはみ出た粒子も消えるように、図全体を背景として保存する
+    _worker["background"] = canvas.copy_from_bbox(figure.bbox)
+    _worker["scatter"] = axes.scatter([], [], c="orange", animated=True)
+    _worker["points"] = (x_point, y_point)
+
+    # GIF用のパレットは最初のフレームから一度だけ作り、全てのフレームで使い回す
+    _draw_frame(0)
+    _worker["palette"] = _frame_image().quantize(256)
+
+
+def _draw_frame(number: int) -> None:
+    """
+    背景を復元し、number番目のフレームの粒子を描く
+
+    Args:
+        number (int): フレーム番号
+    """
+    x_point, y_point = _worker["points"]
+    _worker["canvas"].restore_region(_worker["background"])
+    _worker["scatter"].set_offsets(np.column_stack((x_point[number], y_point[number])))
+    _worker["axes"].draw_artist(_worker["scatter"])
+
+
+def _frame_image() -> Image.Image:
+    """
+    描画済みのフレームを画像として取得する
+
+    Returns:
+        Image.Image: RGBの画像
+    """
+    canvas = _worker["canvas"]
+    return Image.frombuffer(
+        "RGBA", canvas.get_width_height(), canvas.buffer_rgba(), "raw", "RGBA", 0, 1
+    ).convert("RGB")
+
+
+def _render_frames(directory: str, start: int, stop: int, palette: bool) -> int:
+    """
+    start番目からstop-1番目までのフレームを画像として保存する
+
+    Args:
+        directory (str): 画像を保存するディレクトリ
+        start (int): 最初のフレーム番号
+        stop (int): 最後のフレーム番号+1
+        palette (bool): Trueならパレット画像(256色)に変換して保存する
+
+    Returns:
+        int: 保存したフレームの数
+    """
+    for number in range(start, stop):
+        _draw_frame(number)
+        image = _frame_image()
+        if palette:
+            image = image.quantize(palette=_worker["palette"], dither=Image.Dither.NONE)
+        image.save(os.path.join(directory, FRAME_NAME % number), compress_level=1)
+    return stop - start
+
+
+class AnimationExporter:
+    """
+    散布図の時系列を動画として保存するクラス
+    """
+
+    def __init__(
+        self,
+        func: Function2D,
+        x_point: np.ndarray,
+        y_point: np.ndarray,
+        fps: int = 10,
+        dpi: int = 100,
+        processes: int = None,
+        chunk_size: int = 256,
+    ) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            func (Function2D): 目的関数
+            x_point (np.ndarray): 各フレームの粒子のx座標. 形は(フレーム数, 粒子数)
+            y_point (np.ndarray): 各フレームの粒子のy座標. 形は(フレーム数, 粒子数)
+            fps (int, optional): 1秒あたりのフレーム数. Defaults to 10.
+            dpi (int, optional): 解像度. Defaults to 100.
+            processes (int, optional):
+                描画に使うプロセスの数. Noneの場合はCPUの数. Defaults to None.
+            chunk_size (int, optional): 1回にまとめて描画するフレーム数. Defaults to 256.
+        """
+        self.func: Function2D = func
+        self.x_point: np.ndarray = np.asarray(x_point)
+        self.y_point: np.ndarray = np.asarray(y_point)
+        self.fps: int = fps
+        self.dpi: int = dpi
+        self.processes: int = processes
+        self.chunk_size: int = chunk_size
+        self.size: Tuple[float, float] = (6.4, 4.8)
+
+    def render(self, directory: str, palette: bool = False) -> int:
+        """
+        全てのフレームを画像としてディレクトリに保存する
+
+        Args:
+            directory (str): 画像を保存するディレクトリ
+            palette (bool, optional):
+                Trueならパレット画像(256色)として保存する. Defaults to False.
+
+        Returns:
+            int: 保存したフレームの数
+        """
+        frames = len(self.x_point)
+        initargs = (
+            self.func.contour(),
+            (self.func.x_domain, self.func.y_domain),
+            self.func.best,
+            self.x_point,
+            self.y_point,
+            self.size,
+            self.dpi,
+        )
+        starts = range(0, frames, self.chunk_size)
+        with ProcessPoolExecutor(
+            max_workers=self.processes, initializer=_init_worker, initargs=initargs
+        ) as executor:
+            return sum(
+                executor.map(
+                    _render_frames,
+                    [directory] * len(starts),
+                    starts,
+                    [min(start + self.chunk_size, frames) for start in starts],
+                    [palette] * len(starts),
+                )
+            )
+
+    def export(self, path: str) -> None:
+        """
+        動画を保存する. 拡張子が.gifならGIF, それ以外はffmpegを使って保存する
+
+        Args:
+            path (str): 保存先のファイル名
+
+        Raises:
+            RuntimeError: フレームがない場合, GIF以外でffmpegが見つからない場合
+        """
+        if len(self.x_point) == 0:
+            raise RuntimeError("there are no frames to export")
+        is_gif = path.lower().endswith(".gif")
+        if not is_gif and shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg is required to export anything but GIF")
+        with tempfile.TemporaryDirectory() as directory:
+            frames = self.render(directory, palette=is_gif)
+            if is_gif:
+                self.write_gif(directory, frames, path)
+            else:
+                self.write_ffmpeg(directory, path)
+
+    def write_gif(self, directory: str, frames: int, path: str) -> None:
+        """
+        パレット画像として保存したフレームを一枚ずつ読み込みながらGIFを書き出す
+        ヘッダは最初のフレームから一度だけ書き、以降は各フレームのデータを追記するので、
+        メモリに置くのは常に一枚だけになる
+        全てのフレームが同じパレットを使うので、パレットは並べ替えない
+
+        Args:
+            directory (str): フレーム画像のあるディレクトリ
+            frames (int): フレームの数
+            path (str): 保存先のファイル名
+        """
+        with open(path, "wb") as file:
+            for number in range(frames):
+                with Image.open(os.path.join(directory, FRAME_NAME % number)) as image:
+                    if number == 0:
+                        header, _ = GifImagePlugin.getheader(image, info={"loop": 0})
+                        file.writelines(header)
+                    file.writelines(
+                        GifImagePlugin.getdata(image, duration=1000 / self.fps)
+                    )
+            file.write(b";")  # GIFの終端
+
+    def write_ffmpeg(self, directory: str, path: str) -> None:
+        """
+        ffmpegでフレーム画像から動画を作成する
+
+        Args:
+            directory (str): フレーム画像のあるディレクトリ
+            path (str): 保存先のファイル名
+        """
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-framerate",
+                str(self.fps),
+                "-i",
+                os.path.join(directory, FRAME_NAME),
+                "-pix_fmt",
+                "yuv420p",
+                "-vf",
+                "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                path,
+            ],
+            check=True,
+        )
+
+
+def main():
+    """
+    粒子群最適化を実行し、経過を動画として保存する
+    使い方: python animation_exporter.py 保存先 [関数名]
+    """
+    # pylint: disable=import-outside-toplevel
+    from functions import FunctionRegistry
+    from particle_swarm_optimization import ParticleSwarmOptimization
+
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        return 1
+    func = FunctionRegistry.get(sys.argv[2] if len(sys.argv) > 2 else "tmp")
+    scatter_data = ParticleSwarmOptimization(func).learn()
+    exporter = AnimationExporter(
+        func,
+        np.array([x_point for x_point, _ in scatter_data]),
+        np.array([y_point for _, y_point in scatter_data]),
+    )
+    exporter.export(sys.argv[1])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
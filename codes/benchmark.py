@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+登録されている関数を計算方法(numpy, numexpr, numba)ごとに評価し、速度を比較する
+また、代理モデルを使った場合に省略できた評価の割合と、解の質の変化を表示する
+GIFの書き出しに使うメモリがフレーム数によらないことも確認できる
+"""
+
+__author__ = "Hidemasa Kondo (C.A.C.)"
+__date__ = "created at 2026/10/19"
+__version__ = "1.0.0"
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from animation_exporter import FRAME_NAME, AnimationExporter
+from function_2d import BACKENDS, Function2D
+from functions import FunctionRegistry
+from particle_swarm_optimization import ParticleSwarmOptimization
+from surrogate import Surrogate
+
+BATCH_SIZE: int = 1_000_000  # まとめて評価する点の数
+GRID_SIZE: int = 1_000  # 格子の一辺の点の数
+REPEAT: int = 3  # 計測回数. 最も速かった結果を使う
+SEEDS: int = 30  # 代理モデルの比較に使う乱数のシードの数
+
+
+def measure(func: Callable[[], object]) -> float:
+    """
+    関数の実行時間を計測する
+
+    Args:
+        func (Callable[[], object]): 計測する関数
+
+    Returns:
+        float: REPEAT回のうち最も短かった実行時間(秒)
+    """
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark(name: str, func: Function2D) -> None:
+    """
+    一つの関数について、計算方法ごとの実行時間とnumpyに対する速度比を表示する
+
+    Args:
+        name (str): 関数名
+        func (Function2D): 関数オブジェクト
+    """
+    rng = np.random.default_rng(0)
+    batch_x = rng.uniform(*func.x_domain, BATCH_SIZE)
+    batch_y = rng.uniform(*func.y_domain, BATCH_SIZE)
+    grid_x, grid_y = np.meshgrid(
+        np.linspace(*func.x_domain, GRID_SIZE), np.linspace(*func.y_domain, GRID_SIZE)
+    )
+
+    print(name)
+    base = None
+    for backend in reversed(BACKENDS):
+        if func.compile(backend) != backend:
+            print(f"  {backend:8s} unavailable")
+            continue
+        batch = measure(lambda: func.evaluate(batch_x, batch_y))
+        grid = measure(lambda: func.evaluate(grid_x, grid_y))
+        if base is None:
+            base = (batch, grid)
+        print(
+            f"  {backend:8s} batch {batch * 1000:8.2f} ms (x{base[0] / batch:5.2f})"
+            f"  grid {grid * 1000:8.2f} ms (x{base[1] / grid:5.2f})"
+        )
+
+
+def benchmark_surrogate(func: Function2D) -> None:
+    """
+    同じシードで代理モデルを使う場合と使わない場合を比べ、
+    省略できた評価の割合と群の最良値の中央値を表示する
+
+    Args:
+        func (Function2D): 関数オブジェクト
+    """
+    without, with_surrogate, saved = [], [], []
+    for seed in range(SEEDS):
+        random.seed(seed)
+        pso = ParticleSwarmOptimization(func)
+        pso.learn()
+        without.append(pso.group_best_score)
+
+        random.seed(seed)
+        surrogate = Surrogate()
+        pso = ParticleSwarmOptimization(func, surrogate)
+        pso.learn()
+        with_surrogate.append(pso.group_best_score)
+        saved.append(surrogate.saved_ratio())
+    print(
+        f"  saved {np.mean(saved):5.1%}"
+        f"  median best {np.median(without):.3g} -> {np.median(with_surrogate):.3g}"
+    )
+
+
+def gif_peak_memory(frames: int) -> int:
+    """
+    パレット画像のフレームをframes枚作ってGIFに書き出し、プロセスの最大メモリ使用量を返す
+    Pillowの画像はPythonの外で確保されるので、tracemallocではなく最大RSSで計測する
+
+    Args:
+        frames (int): フレームの数
+
+    Returns:
+        int: 書き出した後の最大RSS. 単位はOSによって異なる(LinuxはKiB, macOSはバイト)
+    """
+    rng = np.random.default_rng(0)
+    palette = rng.integers(0, 256, 768, dtype=np.uint8).tobytes()
+    base = np.add.outer(np.arange(480), np.arange(640)) % 256
+    exporter = AnimationExporter(
+        FunctionRegistry.get("tmp"), np.zeros((frames, 1)), np.zeros((frames, 1))
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for number in range(frames):
+            # 画素の一部だけを変え、粒子が動く動画と同じ程度に圧縮される画像にする
+            pixels = base.copy()
+            pixels[rng.integers(0, 480, 300), rng.integers(0, 640, 300)] = number % 256
+            image = Image.fromarray(pixels.astype(np.uint8), "P")
+            image.putpalette(palette)
+            image.save(os.path.join(directory, FRAME_NAME % number), compress_level=1)
+        exporter.write_gif(directory, frames, os.path.join(directory, "check.gif"))
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def main():
+    """登録されている全ての関数の速度と、代理モデルの効果を比較する"""
+    print(f"batch: {BATCH_SIZE} points, grid: {GRID_SIZE}x{GRID_SIZE} points")
+    for name in FunctionRegistry.names():
+        benchmark(name, FunctionRegistry.get(name))
+    print(f"surrogate: median of {SEEDS} seeds, without -> with")
+    for name in FunctionRegistry.names():
+        print(name)
+        benchmark_surrogate(FunctionRegistry.get(name))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+収束の様子(最良値や粒子の広がり)の履歴を間引いて保持するクラス
+区間ごとの最小値と最大値だけを残すので、繰り返し回数が増えても描画する点の数は一定になる
+"""
+
+__author__ = "Hidemasa Kondo (C.A.C.)"
+__date__ = "created at 2026/10/19"
+__version__ = "1.0.0"
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+class DecimatedSeries:
+    """
+    時系列を区間ごとの最小値と最大値に間引いて保持するクラス
+    区間の数がbucketsの2倍を超えたら隣り合う区間をまとめ、区間の幅を2倍にする
+    """
+
+    def __init__(self, buckets: int = 500) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            buckets (int, optional): 保持する区間の最小数. 描画する幅(ピクセル)程度にする.
+                Defaults to 500.
+        """
+        self.buckets: int = buckets
+        self.width: int = 1  # 一つの区間に含まれる値の数
+        self.count: int = 0  # これまでに追加された値の数
+        self.mins: List[float] = []
+        self.maxs: List[float] = []
+
+    def append(self, value: float) -> None:
+        """
+        値を追加する
+
+        Args:
+            value (float): 追加する値
+        """
+        if self.count % self.width == 0:
+            self.mins.append(value)
+            self.maxs.append(value)
+        else:
+            self.mins[-1] = min(self.mins[-1], value)
+            self.maxs[-1] = max(self.maxs[-1], value)
+        self.count += 1
+        if len(self.mins) > 2 * self.buckets and self.count % (2 * self.width) == 0:
+            self.mins = [min(pair) for pair in zip(self.mins[::2], self.mins[1::2])]
+            self.maxs = [max(pair) for pair in zip(self.maxs[::2], self.maxs[1::2])]
+            self.width *= 2
+
+    def line(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        描画用の折れ線を返す
+        区間ごとに最小値と最大値を縦に結ぶので、間引く前の線と見た目が変わらない
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 折れ線のx座標(繰り返し回数)とy座標
+        """
+        starts = np.arange(len(self.mins)) * self.width + 1
+        x = np.repeat(starts, 2)
+        y = np.column_stack((self.mins, self.maxs)).ravel()
+        return x, y
@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+目的関数で評価した全ての座標と評価値を保存するクラス
+一定の数ごとに配列(チャンク)にまとめ、メモリの上限を超えたら古いチャンクからディスクに書き出す
+件数, 最良値, 平均, 分散, 評価値のヒストグラムは追加するたびに更新するので、すぐに取得できる
+評価値がnanや無限大の行も保存するが、件数を別に数えて集計値には含めない
+"""
+
+__author__ = "Hidemasa Kondo (C.A.C.)"
+__date__ = "created at 2026/10/19"
+__version__ = "1.0.0"
+
+import math
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Iterator, List, Tuple, Union
+
+import numpy as np
+
+
+class EvaluationArchive:
+    """
+    評価結果を(x, y, 評価値)の行として追記していく保存先
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 65536,
+        memory_limit: int = 64 * 1024 * 1024,
+        directory: str = None,
+        bins: int = 50,
+        score_range: Tuple[float, float] = None,
+    ) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            chunk_size (int, optional): 一つのチャンクの行数. Defaults to 65536.
+            memory_limit (int, optional):
+                メモリに置くチャンクの合計の上限(バイト). Defaults to 64MiB.
+            directory (str, optional):
+                チャンクを書き出す一時ディレクトリを作る場所. Noneの場合はOSの既定の場所.
+                Defaults to None.
+            bins (int, optional): ヒストグラムの区間の数. Defaults to 50.
+            score_range (Tuple[float, float], optional):
+                ヒストグラムの範囲. Noneの場合は最初のチャンクの最小値と最大値にする.
+                範囲外の値は両端の区間に数える. Defaults to None.
+        """
+        self.chunk_size: int = chunk_size
+        self.memory_limit: int = memory_limit
+        self.parent_directory: str = directory
+        self.directory: str = None  # 最初に書き出すときに作る一時ディレクトリ
+        # closeを呼ばずに破棄された場合やプログラムの終了時に一時ディレクトリを消す
+        self.cleanup: weakref.finalize = None
+        self.bins: int = bins
+        self.score_range: Tuple[float, float] = score_range
+
+        # 保存済みのチャンク. メモリ上の配列か, 書き出したファイルのパス
+        self.chunks: List[Union[np.ndarray, str]] = []
+        self.memory_chunks: int = 0  # メモリ上にあるチャンクの数
+        self.buffer: np.ndarray = np.empty((chunk_size, 3))
+        self.filled: int = 0  # bufferに書き込んだ行数
+
+        self.count: int = 0
+        self.non_finite: int = 0  # 評価値がnanや無限大だった数. 集計値には含めない
+        self.best_score: float = float("inf")
+        self.best_point: Tuple[float, float] = None
+        self.mean: float = 0.0
+        self.m2: float = 0.0  # 平均からの差の2乗の合計(有限の評価値のみ)
+        self.histogram_counts: np.ndarray = (
+            None if score_range is None else np.zeros(bins, dtype=np.int64)
+        )
+
+    def __len__(self) -> int:
+        """
+        保存した評価結果の数を返す
+
+        Returns:
+            int: 評価結果の数
+        """
+        return self.count
+
+    def __enter__(self) -> "EvaluationArchive":
+        """
+        with文で使う. 抜けるときにcloseを呼ぶ
+
+        Returns:
+            EvaluationArchive: 自身
+        """
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """
+        with文を抜けるときに書き出したチャンクを削除する
+        """
+        self.close()
+
+    def append(self, x: float, y: float, score: float) -> None:
+        """
+        評価結果を一つ追加する
+
+        Args:
+            x (float): x座標の値
+            y (float): y座標の値
+            score (float): 評価値. nanや無限大の場合は保存だけして集計しない
+        """
+        # 状態を変える前に区間を求めておく
+        finite = math.isfinite(score)
+        number = (
+            self.bin(score) if finite and self.histogram_counts is not None else None
+        )
+        self.buffer[self.filled] = (x, y, score)
+        self.filled += 1
+
+        self.count += 1
+        if finite:
+            delta = score - self.mean
+            self.mean += delta / (self.count - self.non_finite)
+            self.m2 += delta * (score - self.mean)
+            if score < self.best_score:
+                self.best_score = score
+                self.best_point = (x, y)
+            if number is not None:
+                self.histogram_counts[number] += 1
+        else:
+            self.non_finite += 1
+
+        if self.filled == self.chunk_size:
+            self.flush()
+
+    def extend(self, x: np.ndarray, y: np.ndarray, score: np.ndarray) -> None:
+        """
+        評価結果をまとめて追加する
+
+        Args:
+            x (np.ndarray): x座標の配列
+            y (np.ndarray): y座標の配列
+            score (np.ndarray): 評価値の配列. nanや無限大の値は保存だけして集計しない
+        """
+        rows = np.column_stack((np.ravel(x), np.ravel(y), np.ravel(score))).astype(
+            np.float64
+        )
+        if len(rows) == 0:
+            return
+        self.update_statistics(rows)
+        start = 0
+        while start < len(rows):
+            size = min(self.chunk_size - self.filled, len(rows) - start)
+            segment = rows[start : start + size]
+            if self.histogram_counts is not None:
+                scores = segment[np.isfinite(segment[:, 2]), 2]
+                self.histogram_counts += np.bincount(
+                    self.bin(scores), minlength=self.bins
+                )
+            self.buffer[self.filled : self.filled + size] = segment
+            self.filled += size
+            start += size
+            if self.filled == self.chunk_size:
+                self.flush()
+
+    def update_statistics(self, rows: np.ndarray) -> None:
+        """
+        まとめて追加された評価結果で件数, 最良値, 平均, 分散を更新する
+        評価値がnanや無限大の行は件数だけを数える
+
+        Args:
+            rows (np.ndarray): (x, y, 評価値)の行の配列
+        """
+        finite = np.isfinite(rows[:, 2])
+        previous = self.count - self.non_finite  # これまでの有限の評価値の数
+        self.count += len(rows)
+        self.non_finite += len(rows) - int(np.count_nonzero(finite))
+        rows = rows[finite]
+        if len(rows) == 0:
+            return
+        scores = rows[:, 2]
+        total = previous + len(scores)
+        mean = scores.mean()
+        delta = mean - self.mean
+        weight = previous * len(scores) / total
+        self.m2 += ((scores - mean) ** 2).sum() + delta ** 2 * weight
+        self.mean += delta * len(scores) / total
+        best = int(np.argmin(scores))
+        if scores[best] < self.best_score:
+            self.best_score = float(scores[best])
+            self.best_point = (float(rows[best, 0]), float(rows[best, 1]))
+
+    def bin(self, score: Union[float, np.ndarray]) -> Union[int, np.ndarray]:
+        """
+        有限の評価値が入るヒストグラムの区間の番号を返す
+
+        Args:
+            score (Union[float, np.ndarray]): 有限の評価値
+
+        Returns:
+            Union[int, np.ndarray]: 区間の番号. 範囲外の場合は両端の区間
+        """
+        low, high = self.score_range
+        width = (high - low) / self.bins if high > low else 1.0
+        # 非常に大きい値でも整数に変換できるよう、切り捨てる前に範囲内に収める
+        if np.ndim(score) == 0:
+            return math.floor(min(max((score - low) / width, 0.0), self.bins - 1))
+        number = np.floor(np.clip((score - low) / width, 0, self.bins - 1))
+        return number.astype(np.int64)
+
+    def flush(self) -> None:
+        """
+        bufferをチャンクとして保存し、メモリの上限を超えたら古いチャンクを書き出す
+        """
+        chunk = self.buffer[: self.filled].copy()
+        self.filled = 0
+        scores = chunk[np.isfinite(chunk[:, 2]), 2]
+        if self.histogram_counts is None and len(scores):
+            # ヒストグラムの範囲を有限の評価値がある最初のチャンクから決め、
+            # それまでの値を数える
+            self.score_range = (float(scores.min()), float(scores.max()))
+            self.histogram_counts = np.bincount(self.bin(scores), minlength=self.bins)
+        self.chunks.append(chunk)
+        self.memory_chunks += 1
+        while self.memory_chunks * self.buffer.nbytes > self.memory_limit:
+            self.spill()
+
+    def spill(self) -> None:
+        """
+        メモリ上にある最も古いチャンクをディスクに書き出す
+        """
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(
+                prefix="evaluation_archive_", dir=self.parent_directory
+            )
+            self.cleanup = weakref.finalize(
+                self, shutil.rmtree, self.directory, ignore_errors=True
+            )
+        number = len(self.chunks) - self.memory_chunks
+        path = os.path.join(self.directory, f"chunk_{number:08d}.npy")
+        np.save(path, self.chunks[number])
+        self.chunks[number] = path
+        self.memory_chunks -= 1
+
+    def variance(self) -> float:
+        """
+        評価値の分散を返す
+
+        Returns:
+            float: 有限の評価値の分散. 有限の評価値がない場合はnan
+        """
+        finite_count = self.count - self.non_finite
+        return self.m2 / finite_count if finite_count else float("nan")
+
+    def histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        有限の評価値のヒストグラムを返す
+        範囲が決まる前(最初のチャンクが埋まる前)はbufferから計算する
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 区間ごとの数と, 区間の境界(bins+1個)
+        """
+        if self.histogram_counts is None:
+            scores = self.buffer[: self.filled, 2]
+            return np.histogram(scores[np.isfinite(scores)], bins=self.bins)
+        return self.histogram_counts.copy(), np.linspace(
+            *self.score_range, self.bins + 1
+        )
+
+    def iter_chunks(self) -> Iterator[np.ndarray]:
+        """
+        保存した評価結果をチャンクごとに古い順で返す
+        書き出したチャンクはメモリマップで読み込む
+
+        Yields:
+            np.ndarray: (x, y, 評価値)の行の配列
+        """
+        for chunk in self.chunks:
+            yield np.load(chunk, mmap_mode="r") if isinstance(chunk, str) else chunk
+        if self.filled:
+            yield self.buffer[: self.filled]
+
+    def close(self) -> None:
+        """
+        書き出したチャンクを一時ディレクトリごと削除する
+        メモリ上にあるチャンクと集計値は残る
+        呼ばなかった場合も、破棄されたときかプログラムの終了時に削除される
+        """
+        if self.directory is not None:
+            self.cleanup()
+            self.cleanup = None
+            self.directory = None
+        self.chunks = [chunk for chunk in self.chunks if not isinstance(chunk, str)]
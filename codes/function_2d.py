@@ -3,14 +3,35 @@
 
 """
 2変数(x, y)を入力とする関数を実装するクラス
+numexprやnumbaがインストールされていれば、配列に対する評価をそれらで高速化できる
 """
 
 
 __author__ = "Hidemasa Kondo (C.A.C.)"
-__date__ = "updated at 2021/08/24 (created at 2021/08/11)"
+__date__ = "updated at 2026/10/19 (created at 2021/08/11)"
 __version__ = "1.0.0"
 
-from typing import Callable, Tuple
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+# 式の文字列で使える関数と定数 (numexprと同じ名前にしている)
+EXPRESSION_NAMESPACE: Dict[str, object] = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "exp": np.exp,
+    "log": np.log,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "where": np.where,
+    "pi": np.pi,
+    "e": np.e,
+}
+
+# "auto"で試す順番. make benchで組み込みの関数を計測した結果、ほとんどの関数で
+# numbaが最も速く、numexprはnumpyより遅い関数もあったのでこの順にしている
+BACKENDS: Tuple[str, ...] = ("numba", "numexpr", "numpy")
 
 
 class Function2D:
@@ -23,6 +44,7 @@ class Function2D:
         x_domain: Tuple[int, int] = (0, 10),
         y_domain: Tuple[int, int] = (0, 10),
         best: Tuple[int, int] = (5, 5),
+        expression: str = None,
     ):
         """
         コンストラクタ
@@ -33,11 +55,50 @@ class Function2D:
             x_domain (Tuple[int, int], optional): 関数のx軸の定義域. Defaults to (0, 10).
             y_domain (Tuple[int, int], optional): 関数のy軸の定義域. Defaults to (0, 10).
             best (Tuple[int, int], optional): func(x, y)が最小となるx, y. Defaults to (5, 5).
+            expression (str, optional):
+                funcと同じ関数をnumexprの書式で書いた式. numexprで評価するときに使う.
+                Defaults to None.
         """
         self.x_domain: Tuple[int, int] = x_domain
         self.y_domain: Tuple[int, int] = y_domain
         self.func: Callable[[float, float], float] = func
         self.best: Tuple[int, int] = best
+        self.expression: str = expression
+        self.kernel: Callable[
+            [np.ndarray, np.ndarray], np.ndarray
+        ] = self.numpy_kernel()
+        self.backend: str = "numpy"
+
+    @staticmethod
+    def from_expression(
+        expression: str,
+        x_domain: Tuple[int, int],
+        y_domain: Tuple[int, int],
+        best: Tuple[int, int],
+    ) -> "Function2D":
+        """
+        式の文字列から関数を作成する
+        式の中ではx, yとEXPRESSION_NAMESPACEの関数、定数が使える
+
+        Args:
+            expression (str): 式. 例えば"sin(x) * cos(y)"
+            x_domain (Tuple[int, int]): 関数のx軸の定義域
+            y_domain (Tuple[int, int]): 関数のy軸の定義域
+            best (Tuple[int, int]): 式が最小となるx, y
+
+        Returns:
+            Function2D: 式を評価する関数
+        """
+        code = compile(expression, "<expression>", "eval")
+        return Function2D(
+            func=lambda x, y: eval(  # pylint: disable=eval-used
+                code, {"__builtins__": {}, **EXPRESSION_NAMESPACE}, {"x": x, "y": y}
+            ),
+            x_domain=x_domain,
+            y_domain=y_domain,
+            best=best,
+            expression=expression,
+        )
 
     def __call__(self, x: float, y: float) -> float:
         """
@@ -53,6 +114,160 @@ class Function2D:
         x, y = self.set_point_in_domain(x, y)
         return self.func(x, y)
 
+    def evaluate(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        座標の配列をまとめて評価する
+
+        Args:
+            x (np.ndarray): x座標の配列
+            y (np.ndarray): y座標の配列
+
+        Returns:
+            np.ndarray: 各座標でのfunc(x, y)
+        """
+        x = np.clip(np.asarray(x, dtype=np.float64), *self.x_domain)
+        y = np.clip(np.asarray(y, dtype=np.float64), *self.y_domain)
+        return self.kernel(x, y)
+
+    def contour(self, step: float = 0.1) -> List[np.ndarray]:
+        """
+        等高線を描くための格子点と、その点での値を計算する
+
+        Args:
+            step (float, optional): 格子点の間隔. Defaults to 0.1.
+
+        Returns:
+            List[np.ndarray]: x座標の格子, y座標の格子, 格子点での値
+        """
+        x = np.arange(self.x_domain[0], self.x_domain[1] + 0.000001, step)
+        y = np.arange(self.y_domain[0], self.y_domain[1] + 0.000001, step)
+        x_mesh, y_mesh = np.meshgrid(x, y)
+        return [x_mesh, y_mesh, self.evaluate(x_mesh, y_mesh)]
+
+    def compile(self, backend: str = "auto") -> str:
+        """
+        evaluateで使う計算方法を設定する
+        "auto"の場合はBACKENDSの順(numba, numexpr, numpy)に使えるものを選ぶ
+        numbaは初回にコンパイルの時間がかかるが、評価は最も速かった
+        numbaやnumexprがインストールされていない、もしくは関数を扱えない場合はnumpyを使う
+
+        Args:
+            backend (str, optional): "auto", "numba", "numexpr", "numpy"のどれか.
+                Defaults to "auto".
+
+        Raises:
+            ValueError: backendが不明な場合
+
+        Returns:
+            str: 実際に使われることになった計算方法
+        """
+        if backend != "auto" and backend not in BACKENDS:
+            raise ValueError(f"unknown backend: {backend}")
+        candidates = BACKENDS if backend == "auto" else (backend, "numpy")
+        for candidate in candidates:
+            kernel = self.make_kernel(candidate)
+            if kernel is not None:
+                self.kernel = kernel
+                self.backend = candidate
+                break
+        return self.backend
+
+    def make_kernel(
+        self, backend: str
+    ) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        """
+        指定した計算方法でfuncを評価する関数を作成し、試しに評価する
+
+        Args:
+            backend (str): "numba", "numexpr", "numpy"のどれか
+
+        Returns:
+            Callable[[np.ndarray, np.ndarray], np.ndarray]:
+                配列を評価する関数. 作成できなかった場合はNone
+        """
+        builders = {
+            "numba": self.numba_kernel,
+            "numexpr": self.numexpr_kernel,
+            "numpy": self.numpy_kernel,
+        }
+        kernel = builders[backend]()
+        if kernel is not None and not self.accepts_arrays(kernel):
+            kernel = None
+        return kernel
+
+    def accepts_arrays(
+        self, kernel: Callable[[np.ndarray, np.ndarray], np.ndarray]
+    ) -> bool:
+        """
+        定義域の両端の2点で試しに評価し、配列を受け取って同じ形の配列を返すか確かめる
+        要素が1つの配列はifやmath.sinでスカラーとして扱われてしまうので、値の異なる2点で試す
+
+        Args:
+            kernel (Callable[[np.ndarray, np.ndarray], np.ndarray]): 試す関数
+
+        Returns:
+            bool: 配列を評価できればTrue
+        """
+        x = np.array(self.x_domain, dtype=np.float64)
+        y = np.array(self.y_domain, dtype=np.float64)
+        try:
+            return np.shape(kernel(x, y)) == x.shape
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    def numpy_kernel(self) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        """
+        funcをnumpyの配列に対して評価する関数を作成する
+        funcがスカラーしか扱えない場合(ifやmathの関数を使っている場合など)は、
+        np.vectorizeで1点ずつ評価する
+
+        Returns:
+            Callable[[np.ndarray, np.ndarray], np.ndarray]: 配列を評価する関数
+        """
+        if self.accepts_arrays(self.func):
+            return self.func
+        return np.vectorize(self.func, otypes=[np.float64])
+
+    def numexpr_kernel(self) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        """
+        expressionをnumexprで評価する関数を作成する
+
+        Returns:
+            Callable[[np.ndarray, np.ndarray], np.ndarray]:
+                配列を評価する関数. numexprがないかexpressionがない場合はNone
+        """
+        try:
+            import numexpr  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            return None
+        if self.expression is None:
+            return None
+
+        def kernel(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+            return numexpr.evaluate(
+                self.expression, local_dict={"x": x, "y": y, "pi": np.pi, "e": np.e}
+            )
+
+        return kernel
+
+    def numba_kernel(self) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        """
+        funcをnumbaでコンパイルした関数を作成する
+
+        Returns:
+            Callable[[np.ndarray, np.ndarray], np.ndarray]:
+                配列を評価する関数. numbaがないかfuncをコンパイルできない場合はNone
+        """
+        try:
+            import numba  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            return None
+        try:
+            return numba.vectorize(["float64(float64, float64)"])(self.func)
+        except Exception:  # pylint: disable=broad-except
+            # numbaでコンパイルできない関数(式の文字列から作った関数など)はNone
+            return None
+
     def set_point_in_domain(self, x: float, y: float) -> Tuple[float, float]:
         """
         座標を定義域の内側に無理やり調整する関数
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 
 """
-ベンチマーク関数を集約したクラス
+ベンチマーク関数を集約したクラスと、名前から関数を取得するための登録簿
 関数に関しては
 https://en.wikipedia.org/wiki/Test_functions_for_optimization
 と
@@ -11,9 +11,11 @@ https://qiita.com/tomitomi3/items/d4318bf7afbc1c835dda#bukin-function-n6
 """
 
 __author__ = "Hidemasa Kondo (C.A.C.)"
-__date__ = "created at 2021/08/24"
+__date__ = "updated at 2026/10/19 (created at 2021/08/24)"
 __version__ = "1.0.0"
 
+from typing import Callable, Dict, List, Tuple
+
 import numpy as np
 
 from function_2d import Function2D
@@ -24,6 +26,16 @@ class TestFunctions:
     テスト関数を集めたクラス
     """
 
+    @staticmethod
+    def default_function() -> Function2D:
+        """
+        (5, 5)で最小となる2次関数を返す関数
+
+        Returns:
+            Function2D: (x - 5)^2 + (y - 5)^2
+        """
+        return Function2D(expression="(x - 5) ** 2 + (y - 5) ** 2")
+
     @staticmethod
     def ackley_function() -> Function2D:
         """
@@ -40,6 +52,8 @@ class TestFunctions:
             x_domain=(-10, 10),
             y_domain=(-10, 10),
             best=(0, 0),
+            expression="20 - 20 * exp(-0.2 * sqrt(0.5 * (x ** 2 + y ** 2))) + e"
+            " - exp(0.5 * (cos(2 * pi * x) + cos(2 * pi * y)))",
         )
 
     @staticmethod
@@ -55,6 +69,7 @@ class TestFunctions:
             x_domain=(-5, 5),
             y_domain=(-5, 5),
             best=(1, 1),
+            expression="100 * (y - x ** 2) ** 2 + (1 - x) ** 2",
         )
 
     @staticmethod
@@ -71,6 +86,7 @@ class TestFunctions:
             x_domain=(-15, -5),
             y_domain=(-3, 3),
             best=(-10, 1),
+            expression="100 * sqrt(abs(y - 0.01 * x ** 2)) + 0.01 * abs(x + 10)",
         )
 
     @staticmethod
@@ -88,6 +104,9 @@ class TestFunctions:
             x_domain=(-10, 10),
             y_domain=(-10, 10),
             best=(1, 1),
+            expression="sin(3 * pi * x) ** 2"
+            " + (x - 1) ** 2 * (1 + sin(3 * pi * y) ** 2)"
+            " + (y - 1) ** 2 * (1 + sin(2 * pi * y) ** 2)",
         )
 
     @staticmethod
@@ -105,4 +124,96 @@ class TestFunctions:
             x_domain=(-20, 20),
             y_domain=(-20, 20),
             best=(np.pi, np.pi),
+            expression="-cos(x) * cos(y) * exp(-((x - pi) ** 2 + (y - pi) ** 2))",
+        )
+
+
+class FunctionRegistry:
+    """
+    名前と関数を対応付ける登録簿
+    関数は初めて取得されたときに生成し、指定された計算方法でコンパイルする
+    """
+
+    factories: Dict[str, Callable[[], Function2D]] = {
+        "tmp": TestFunctions.default_function,
+        "Ackley Function": TestFunctions.ackley_function,
+        "Rosenbrock Function": TestFunctions.rosenbrock_function,
+        "Bukin function N.6": TestFunctions.bukin_function_n6,
+        "Levi function N.13": TestFunctions.levi_function_n13,
+        "Easom function": TestFunctions.easom_function,
+    }
+    cache: Dict[Tuple[str, str], Function2D] = {}
+    # Function2D.compileに渡す既定の計算方法. numbaのコンパイルは起動を遅くし、
+    # 画面で使う等高線程度の点数ではnumpyで十分速いので、既定ではnumpyを使う
+    backend: str = "numpy"
+
+    @staticmethod
+    def register(name: str, factory: Callable[[], Function2D]) -> None:
+        """
+        関数を登録する. 同じ名前が登録済みの場合は上書きする
+
+        Args:
+            name (str): 関数名
+            factory (Callable[[], Function2D]): 関数オブジェクトを生成する関数
+        """
+        FunctionRegistry.factories[name] = factory
+        for key in [key for key in FunctionRegistry.cache if key[0] == name]:
+            del FunctionRegistry.cache[key]
+
+    @staticmethod
+    def register_expression(
+        name: str,
+        expression: str,
+        x_domain: Tuple[int, int],
+        y_domain: Tuple[int, int],
+        best: Tuple[int, int],
+    ) -> None:
+        """
+        式の文字列で書かれた関数を登録する
+
+        Args:
+            name (str): 関数名
+            expression (str): 式. 書式はFunction2D.from_expressionを参照
+            x_domain (Tuple[int, int]): 関数のx軸の定義域
+            y_domain (Tuple[int, int]): 関数のy軸の定義域
+            best (Tuple[int, int]): 式が最小となるx, y
+        """
+        FunctionRegistry.register(
+            name,
+            lambda: Function2D.from_expression(expression, x_domain, y_domain, best),
         )
+
+    @staticmethod
+    def names() -> List[str]:
+        """
+        登録されている関数名を返す
+
+        Returns:
+            List[str]: 関数名のリスト
+        """
+        return list(FunctionRegistry.factories.keys())
+
+    @staticmethod
+    def get(name: str, backend: str = None) -> Function2D:
+        """
+        名前から関数オブジェクトを取得する
+        名前と計算方法の組ごとに、初めて呼ばれたときに生成し、以降は同じものを返す
+
+        Args:
+            name (str): 関数名
+            backend (str, optional): Function2D.compileに渡す計算方法.
+                大量の点を評価する場合は"auto"を指定する.
+                Noneの場合はFunctionRegistry.backend. Defaults to None.
+
+        Raises:
+            KeyError: 登録されていない名前の場合
+
+        Returns:
+            Function2D: 関数オブジェクト
+        """
+        key = (name, FunctionRegistry.backend if backend is None else backend)
+        if key not in FunctionRegistry.cache:
+            func = FunctionRegistry.factories[name]()
+            func.compile(key[1])
+            FunctionRegistry.cache[key] = func
+        return FunctionRegistry.cache[key]
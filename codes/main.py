@@ -6,16 +6,17 @@
 """
 
 __author__ = "Hidemasa Kondo (C.A.C.)"
-__date__ = "updated at 2021/08/30 (created at 2021/08/12)"
+__date__ = "updated at 2026/10/19 (created at 2021/08/12)"
 __version__ = "1.0.0"
 
 import sys
 
-from window_2d import Window2D
-
 
 def main():
     """メイン関数やでー"""
+    # GUI関連の読み込みは重いため、ウィンドウを作るときまで遅らせる
+    from window_2d import Window2D  # pylint: disable=import-outside-toplevel
+
     app = Window2D()
     app.learn()
     app.display_at_tk()
@@ -7,14 +7,18 @@
 
 
 __author__ = "Hidemasa Kondo (C.A.C.)"
-__date__ = "updated at 2021/08/30 (created at 2021/08/04)"
+__date__ = "updated at 2026/10/19 (created at 2021/08/04)"
 __version__ = "1.0.0"
 
+import math
 import random
 from copy import copy
-from typing import Final, List, Tuple
+from typing import Final, Iterator, List, Tuple
 
+from evaluation_archive import EvaluationArchive
 from function_2d import Function2D
+from spatial_index import SwarmDiversity
+from surrogate import Surrogate
 
 
 class ParticleSwarmOptimization:
@@ -74,61 +78,169 @@ class ParticleSwarmOptimization:
                     * (group_best_point[i] - self.point[i])
                 )
 
-        def eval(self) -> None:
-            """現在の座標を評価し、これまでの最も良い座標であれば更新する"""
+        def eval(self) -> float:
+            """
+            現在の座標を評価し、これまでの最も良い座標であれば更新する
+
+            Returns:
+                float: 現在の座標の評価値
+            """
             result = self.func(*self.point)
             if self.my_best_score > result:
                 self.my_best_score = result
                 self.my_best_point = copy(self.point)
-
-    def __init__(self, func: Function2D) -> None:
+            return result
+
+    def __init__(
+        self,
+        func: Function2D,
+        surrogate: Surrogate = None,
+        diversity: SwarmDiversity = None,
+        archive: EvaluationArchive = None,
+    ) -> None:
         """
         コンストラクタ
 
         Args:
             func (Function2D): 目的関数
+            surrogate (Surrogate, optional):
+                評価を省略するための代理モデル. Noneの場合は全ての粒子を評価する.
+                Defaults to None.
+            diversity (SwarmDiversity, optional):
+                群の多様性を計測し、再配置を判断する. Noneの場合は計測しない.
+                Defaults to None.
+            archive (EvaluationArchive, optional):
+                全ての評価結果の保存先. Noneの場合は保存しない. Defaults to None.
         """
         self.func: Function2D = func
-        self.particles: List[self.Particle] = [
-            self.Particle(self.func) for _ in range(ParticleSwarmOptimization.N)
-        ]
+        self.surrogate: Surrogate = surrogate
+        if self.surrogate is not None:
+            self.surrogate.set_domain(func.x_domain, func.y_domain)
+        self.diversity: SwarmDiversity = diversity
+        self.archive: EvaluationArchive = archive
+        self.particles: List[self.Particle] = self.make_particles()
         self.group_best_point: List[float] = []
         self.group_best_score: float = float("inf")
 
+    def make_particles(self) -> List[Particle]:
+        """
+        N個の粒子を作成する
+        粒子は作成時に初期位置を評価するので、その結果も記録する
+
+        Returns:
+            List[Particle]: 粒子のリスト
+        """
+        particles = [
+            self.Particle(self.func) for _ in range(ParticleSwarmOptimization.N)
+        ]
+        for particle in particles:
+            self.record(particle.point, particle.my_best_score)
+        return particles
+
+    def record(self, point: List[float], score: float) -> None:
+        """
+        目的関数で評価した結果を代理モデル, 多様性の計測, 評価結果の保存先に記録する
+
+        Args:
+            point (List[float]): 評価した座標
+            score (float): 評価値
+        """
+        if self.surrogate is not None:
+            self.surrogate.add(point, score)
+        if self.diversity is not None:
+            self.diversity.add_evaluation(*point)
+        if self.archive is not None:
+            self.archive.append(*point, score)
+
     def set_func(self, func: Function2D) -> None:
         """
         関数を設定する
+        代理モデルと多様性の記録は前の関数の評価結果なので初期化する
+        粒子と群の最良はそのまま残るので、最初から学習し直す場合はresetも呼ぶ
 
         Args:
             func (Function2D): 目的関数
         """
         self.func = func
+        if self.surrogate is not None:
+            self.surrogate.reset()
+            self.surrogate.set_domain(func.x_domain, func.y_domain)
+        if self.diversity is not None:
+            self.diversity.reset()
 
     def learn(self) -> List[Tuple[List[float]]]:
         """
         群を動かす
         """
-        scatter_data = []
+        return list(self.learn_iter())
+
+    def learn_iter(self) -> Iterator[Tuple[List[float]]]:
+        """
+        群を動かし、1回移動するごとに全ての粒子の座標を返す
+
+        Yields:
+            Tuple[List[float]]: 全ての粒子のx座標のリストとy座標のリスト
+        """
         for _ in range(ParticleSwarmOptimization.LOOP):
             self.eval()
+            if self.diversity is not None and self.diversity.observe(
+                [particle.point for particle in self.particles]
+            ):
+                self.restart()
             self.update_velocity()
             self.move()
-            scatter_data.append(
-                (
-                    list(map(lambda particle: particle.point[0], self.particles)),
-                    list(map(lambda particle: particle.point[1], self.particles)),
-                )
+            yield (
+                list(map(lambda particle: particle.point[0], self.particles)),
+                list(map(lambda particle: particle.point[1], self.particles)),
+            )
+
+    def statistics(self) -> Tuple[float, float, float]:
+        """
+        収束の様子を表す値を計算する
+
+        Returns:
+            Tuple[float, float, float]:
+                群の最良値, 粒子それぞれの最良値の平均, 粒子の重心からの距離の平均
+        """
+        n = len(self.particles)
+        center_x = sum(particle.point[0] for particle in self.particles) / n
+        center_y = sum(particle.point[1] for particle in self.particles) / n
+        spread = (
+            sum(
+                math.hypot(particle.point[0] - center_x, particle.point[1] - center_y)
+                for particle in self.particles
             )
-        return scatter_data
+            / n
+        )
+        mean_best = sum(particle.my_best_score for particle in self.particles) / n
+        return self.group_best_score, mean_best, spread
 
     def eval(self) -> None:
-        """全ての粒子を評価する"""
-        for particle in self.particles:
-            particle.eval()
+        """
+        全ての粒子を評価する
+        代理モデルがある場合は、見込みのある粒子だけを評価する
+        """
+        if self.surrogate is None:
+            targets = self.particles
+        else:
+            promising = self.surrogate.screen(
+                [particle.point for particle in self.particles],
+                [particle.my_best_score for particle in self.particles],
+                self.group_best_point,
+            )
+            targets = [p for p, flag in zip(self.particles, promising) if flag]
+        for particle in targets:
+            self.record(particle.point, particle.eval())
             if particle.my_best_score < self.group_best_score:
                 self.group_best_score = particle.my_best_score
                 self.group_best_point = copy(particle.my_best_point)
 
+    def restart(self) -> None:
+        """
+        群の最良を残したまま、全ての粒子を定義域の中に再配置する
+        """
+        self.particles = self.make_particles()
+
     def move(self) -> None:
         """全ての粒子を移動させる"""
         for particle in self.particles:
@@ -198,8 +310,10 @@ class ParticleSwarmOptimization:
         """
         学習を初期化する
         """
-        self.particles = [
-            self.Particle(self.func) for _ in range(ParticleSwarmOptimization.N)
-        ]
+        if self.surrogate is not None:
+            self.surrogate.reset()
+        if self.diversity is not None:
+            self.diversity.reset()
+        self.particles = self.make_particles()
         self.group_best_point = []
         self.group_best_score = float("inf")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+評価した座標を格子状に分割して管理する空間索引と、それを使った群の多様性の計測
+全ての点の組の距離を計算せずに、最近傍の距離や混雑度を求める
+"""
+
+__author__ = "Hidemasa Kondo (C.A.C.)"
+__date__ = "created at 2026/10/19"
+__version__ = "1.0.0"
+
+import math
+from typing import Dict, List, Tuple
+
+
+class GridIndex:
+    """
+    平面を一辺cell_sizeの正方形のセルに分け、点をセルごとに保持する索引
+    点の追加はO(1)で、近傍の検索は近くのセルだけを調べる
+    """
+
+    def __init__(self, cell_size: float = 0.5) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            cell_size (float, optional): セルの一辺の長さ. Defaults to 0.5.
+        """
+        self.cell_size: float = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.points: List[Tuple[float, float]] = []
+        self.min_cell: List[int] = [0, 0]  # 点のあるセルの番号の最小値
+        self.max_cell: List[int] = [0, 0]  # 点のあるセルの番号の最大値
+
+    def __len__(self) -> int:
+        """
+        保持している点の数を返す
+
+        Returns:
+            int: 点の数
+        """
+        return len(self.points)
+
+    def cell(self, x: float, y: float) -> Tuple[int, int]:
+        """
+        座標が属するセルの番号を返す
+
+        Args:
+            x (float): x座標の値
+            y (float): y座標の値
+
+        Returns:
+            Tuple[int, int]: セルの番号
+        """
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def add(self, x: float, y: float) -> int:
+        """
+        点を追加する
+
+        Args:
+            x (float): x座標の値
+            y (float): y座標の値
+
+        Returns:
+            int: 追加した点の番号
+        """
+        key = self.cell(x, y)
+        if not self.points:
+            self.min_cell = list(key)
+            self.max_cell = list(key)
+        for i in range(2):
+            self.min_cell[i] = min(self.min_cell[i], key[i])
+            self.max_cell[i] = max(self.max_cell[i], key[i])
+        number = len(self.points)
+        self.points.append((x, y))
+        self.cells.setdefault(key, []).append(number)
+        return number
+
+    def ring(self, key: Tuple[int, int], distance: int) -> List[int]:
+        """
+        あるセルからチェビシェフ距離でちょうどdistanceだけ離れたセルにある点を返す
+
+        Args:
+            key (Tuple[int, int]): 中心のセルの番号
+            distance (int): セルの距離
+
+        Returns:
+            List[int]: 点の番号のリスト
+        """
+        if distance == 0:
+            return self.cells.get(key, [])
+        numbers = []
+        for dx in range(-distance, distance + 1):
+            step = 1 if abs(dx) == distance else 2 * distance
+            for dy in range(-distance, distance + 1, step):
+                numbers.extend(self.cells.get((key[0] + dx, key[1] + dy), []))
+        return numbers
+
+    def nearest(self, x: float, y: float, exclude: int = None) -> Tuple[int, float]:
+        """
+        最も近い点を探す
+
+        Args:
+            x (float): x座標の値
+            y (float): y座標の値
+            exclude (int, optional): 探索から除く点の番号. Defaults to None.
+
+        Returns:
+            Tuple[int, float]: 最も近い点の番号と距離. 点がない場合は(-1, inf)
+        """
+        key = self.cell(x, y)
+        limit = max(
+            abs(key[0] - self.min_cell[0]),
+            abs(key[0] - self.max_cell[0]),
+            abs(key[1] - self.min_cell[1]),
+            abs(key[1] - self.max_cell[1]),
+        )
+        best = (-1, float("inf"))
+        for distance in range(limit + 1):
+            # 距離distance以上のセルにある点は、(distance - 1) * cell_size以上離れている
+            if best[1] <= (distance - 1) * self.cell_size:
+                break
+            for number in self.ring(key, distance):
+                if number == exclude:
+                    continue
+                point = self.points[number]
+                length = math.hypot(point[0] - x, point[1] - y)
+                if length < best[1]:
+                    best = (number, length)
+        return best
+
+    def count_within(self, x: float, y: float, radius: float) -> int:
+        """
+        半径radius以内にある点の数を数える
+
+        Args:
+            x (float): x座標の値
+            y (float): y座標の値
+            radius (float): 半径
+
+        Returns:
+            int: 点の数
+        """
+        key = self.cell(x, y)
+        count = 0
+        for distance in range(math.ceil(radius / self.cell_size) + 1):
+            for number in self.ring(key, distance):
+                point = self.points[number]
+                if math.hypot(point[0] - x, point[1] - y) <= radius:
+                    count += 1
+        return count
+
+
+class SwarmDiversity:
+    """
+    群の多様性を毎回計測し、評価した座標の重複を数えるクラス
+    群が小さくまとまりすぎた場合に粒子を再配置するかを判断する
+    """
+
+    def __init__(
+        self,
+        cell_size: float = 0.5,
+        restart_radius: float = None,
+        duplicate_distance: float = 1e-3,
+    ) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            cell_size (float, optional):
+                索引のセルの一辺の長さ. 混雑度を数える半径にも使う. Defaults to 0.5.
+            restart_radius (float, optional):
+                群の半径がこれより小さくなったら再配置する. Noneの場合は再配置しない.
+                Defaults to None.
+            duplicate_distance (float, optional):
+                評価済みの座標とこの距離以内の座標を重複とみなす. Defaults to 1e-3.
+        """
+        self.cell_size: float = cell_size
+        self.restart_radius: float = restart_radius
+        self.duplicate_distance: float = duplicate_distance
+        self.archive: GridIndex = GridIndex(cell_size)
+        # 各回の(最近傍の距離の平均, 群の半径, 混雑度)
+        self.history: List[Tuple[float, float, float]] = []
+        self.duplicates: int = 0  # 重複して評価した回数
+        self.restarts: int = 0  # 再配置した回数
+
+    def add_evaluation(self, x: float, y: float) -> bool:
+        """
+        評価した座標を記録する
+
+        Args:
+            x (float): x座標の値
+            y (float): y座標の値
+
+        Returns:
+            bool: 評価済みの座標と重複していればTrue
+        """
+        duplicate = self.archive.nearest(x, y)[1] <= self.duplicate_distance
+        if duplicate:
+            self.duplicates += 1
+        self.archive.add(x, y)
+        return duplicate
+
+    def observe(self, points: List[List[float]]) -> bool:
+        """
+        現在の粒子の座標から多様性を計測し、historyに追加する
+
+        Args:
+            points (List[List[float]]): 粒子の座標のリスト
+
+        Returns:
+            bool: 再配置が必要ならTrue. 粒子が2個未満の場合は計測せずFalse
+        """
+        if len(points) < 2:
+            # 最近傍や広がりが定義できず、再配置しても動けなくなるだけなので計測しない
+            return False
+        index = GridIndex(self.cell_size)
+        for point in points:
+            index.add(*point)
+        nearest = [
+            index.nearest(*point, exclude=i)[1] for i, point in enumerate(points)
+        ]
+        center_x = sum(point[0] for point in points) / len(points)
+        center_y = sum(point[1] for point in points) / len(points)
+        radius = max(
+            math.hypot(point[0] - center_x, point[1] - center_y) for point in points
+        )
+        crowding = sum(
+            index.count_within(*point, self.cell_size) - 1 for point in points
+        ) / len(points)
+        self.history.append((sum(nearest) / len(points), radius, crowding))
+        if self.restart_radius is not None and radius < self.restart_radius:
+            self.restarts += 1
+            return True
+        return False
+
+    def reset(self) -> None:
+        """
+        記録を初期化する
+        """
+        self.archive = GridIndex(self.cell_size)
+        self.history = []
+        self.duplicates = 0
+        self.restarts = 0
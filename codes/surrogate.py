@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+目的関数の評価が重い場合に使う代理モデル
+過去の評価結果から近傍の点を使って値を予測し、見込みのない座標の評価を省略する
+"""
+
+__author__ = "Hidemasa Kondo (C.A.C.)"
+__date__ = "created at 2026/10/19"
+__version__ = "1.0.0"
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+
+class Surrogate:
+    """
+    k近傍の逆距離加重で目的関数を近似する代理モデル
+    直近のmax_points個の評価結果だけを保持する
+    """
+
+    def __init__(
+        self,
+        trust_radius: float = 0.05,
+        kappa: float = 2.0,
+        margin: float = 0.0,
+        elite: int = 3,
+        k: int = 4,
+        min_points: int = 10,
+        max_points: int = 1000,
+    ) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            trust_radius (float, optional):
+                最も近い評価済みの点がこの距離より遠い場合は予測を信用しない.
+                定義域の対角線の長さに対する割合で指定する. Defaults to 0.05.
+            kappa (float, optional):
+                予測の不確かさにかける係数. 大きいほど評価を省略しにくくなる. Defaults to 2.0.
+            margin (float, optional):
+                予測の下限が自身の最良値+marginより小さければ見込みがあるとする.
+                Defaults to 0.0.
+            elite (int, optional):
+                群の最良の座標に近い順にこの数の粒子は必ず評価する. Defaults to 3.
+            k (int, optional): 予測に使う近傍点の数. Defaults to 4.
+            min_points (int, optional):
+                評価済みの点がこの数より少ない間は予測を信用しない. Defaults to 10.
+            max_points (int, optional): 保持する評価結果の最大数. Defaults to 1000.
+        """
+        # pylint: disable=too-many-arguments
+        self.trust_radius: float = trust_radius
+        self.kappa: float = kappa
+        self.margin: float = margin
+        self.elite: int = elite
+        self.k: int = k
+        self.min_points: int = min_points
+        self.max_points: int = max_points
+        self.scale: float = 1.0  # 定義域の対角線の長さ
+
+        self.points: np.ndarray = np.empty((max_points, 2))
+        self.scores: np.ndarray = np.empty(max_points)
+        self.size: int = 0  # 保持している評価結果の数
+        self.head: int = 0  # 次に書き込む位置
+
+        self.true_evaluations: int = 0  # 目的関数で評価した回数
+        self.saved_evaluations: int = 0  # 評価を省略した回数
+
+    def set_domain(
+        self, x_domain: Tuple[float, float], y_domain: Tuple[float, float]
+    ) -> None:
+        """
+        定義域を設定する. trust_radiusはこの対角線の長さに対する割合になる
+
+        Args:
+            x_domain (Tuple[float, float]): x軸の定義域
+            y_domain (Tuple[float, float]): y軸の定義域
+        """
+        self.scale = math.hypot(x_domain[1] - x_domain[0], y_domain[1] - y_domain[0])
+
+    def add(self, point: List[float], score: float) -> None:
+        """
+        目的関数で評価した結果を追加する
+
+        Args:
+            point (List[float]): 評価した座標
+            score (float): 評価値
+        """
+        self.points[self.head] = point
+        self.scores[self.head] = score
+        self.head = (self.head + 1) % self.max_points
+        self.size = min(self.size + 1, self.max_points)
+        self.true_evaluations += 1
+
+    def predict(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        座標の評価値を予測する
+
+        Args:
+            points (np.ndarray): 座標の配列. 形は(点の数, 2)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                予測値, 予測値の下限, 最も近い評価済みの点までの距離
+        """
+        known = self.points[: self.size]
+        distances = np.linalg.norm(points[:, np.newaxis, :] - known, axis=2)
+        k = min(self.k, self.size)
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        weights = 1 / np.maximum(nearest_distances, 1e-12) ** 2
+        predictions = (weights * self.scores[nearest]).sum(axis=1) / weights.sum(axis=1)
+
+        # 逆距離加重の予測値は近傍の値の間にしかならず、最適解の近くで値を過大に見積もる
+        # 近傍の点の間の傾きから、最も近い点から離れた分だけ下がりうる量を見積もる
+        rows = np.arange(len(points))
+        closest = nearest[rows, np.argmin(nearest_distances, axis=1)]
+        distance = nearest_distances.min(axis=1)
+        lower_bounds = (
+            predictions - self.kappa * self.slope(nearest, closest) * distance
+        )
+        return predictions, lower_bounds, distance
+
+    def slope(self, nearest: np.ndarray, closest: np.ndarray) -> np.ndarray:
+        """
+        近傍の点と最も近い点の間の、評価値の傾きの最大値を求める
+
+        Args:
+            nearest (np.ndarray): 近傍の点の番号. 形は(点の数, k)
+            closest (np.ndarray): 最も近い点の番号. 形は(点の数,)
+
+        Returns:
+            np.ndarray: 傾きの最大値. 形は(点の数,)
+        """
+        gaps = np.linalg.norm(
+            self.points[nearest] - self.points[closest][:, np.newaxis, :], axis=2
+        )
+        rises = np.abs(self.scores[nearest] - self.scores[closest][:, np.newaxis])
+        return np.where(gaps > 0, rises / np.maximum(gaps, 1e-12), 0).max(axis=1)
+
+    def screen(
+        self,
+        points: List[List[float]],
+        best_scores: List[float],
+        group_best_point: List[float],
+    ) -> np.ndarray:
+        """
+        目的関数で評価すべき座標を選ぶ
+        予測を信用できない座標, 予測の下限が自身の最良値を下回る座標,
+        群の最良の座標に近いelite個の座標を選ぶ
+
+        Args:
+            points (List[List[float]]): 粒子の座標のリスト
+            best_scores (List[float]): 粒子それぞれのこれまでの最良値
+            group_best_point (List[float]):
+                群の最良の座標. まだない場合は空のリストで、全ての座標を選ぶ
+
+        Returns:
+            np.ndarray: 評価すべき座標ならTrueとなる配列
+        """
+        if self.size < self.min_points or not group_best_point:
+            # 群の最良がまだ決まっていない間は全て評価する
+            return np.ones(len(points), dtype=bool)
+        points = np.asarray(points, dtype=np.float64)
+        _, lower_bounds, distances = self.predict(points)
+        promising = (distances > self.trust_radius * self.scale) | (
+            lower_bounds < np.asarray(best_scores) + self.margin
+        )
+        if self.elite > 0:
+            gaps = np.linalg.norm(points - np.asarray(group_best_point), axis=1)
+            promising[np.argsort(gaps)[: self.elite]] = True
+        self.saved_evaluations += int(np.count_nonzero(~promising))
+        return promising
+
+    def saved_ratio(self) -> float:
+        """
+        評価を省略できた割合を返す
+
+        Returns:
+            float: 省略した回数 / (評価した回数 + 省略した回数)
+        """
+        total = self.true_evaluations + self.saved_evaluations
+        return self.saved_evaluations / total if total else 0.0
+
+    def reset(self) -> None:
+        """
+        評価結果と回数を初期化する
+        """
+        self.size = 0
+        self.head = 0
+        self.true_evaluations = 0
+        self.saved_evaluations = 0
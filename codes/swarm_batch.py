@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+独立した複数の粒子群をまとめて一つの配列として動かすクラス
+小さな群をたくさん試す場合に、群ごとのPythonの処理を省いて高速に計算する
+"""
+
+__author__ = "Hidemasa Kondo (C.A.C.)"
+__date__ = "created at 2026/10/19"
+__version__ = "1.0.0"
+
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+from evaluation_archive import EvaluationArchive
+from function_2d import Function2D
+from particle_swarm_optimization import ParticleSwarmOptimization
+
+
+class SwarmBatch:
+    """
+    B個の粒子群を形が(B, N, 2)の配列で表し、全ての群を同時に1回ずつ動かすクラス
+    更新式はParticleSwarmOptimizationと同じ
+    """
+
+    BLOCK: int = 32  # 乱数をまとめて生成する移動回数
+
+    def __init__(
+        self,
+        func: Function2D,
+        seeds: Sequence[int],
+        n: int = None,
+        c1: Union[float, Sequence[float]] = None,
+        c2: Union[float, Sequence[float]] = None,
+        w: Union[float, Sequence[float]] = None,
+        archive: EvaluationArchive = None,
+    ) -> None:
+        """
+        コンストラクタ
+        係数を省略した場合はParticleSwarmOptimizationの設定を使う
+
+        Args:
+            func (Function2D): 目的関数. 配列をまとめて評価するので、
+                FunctionRegistry.get(name, "auto")のようにコンパイルしたものを渡すと速い
+            seeds (Sequence[int]): 群ごとの乱数のシード. 群の数はこの長さになる
+            n (int, optional): 群に属する粒子の数. Defaults to None.
+            c1 (Union[float, Sequence[float]], optional):
+                自身の最良に対する係数. 群ごとに指定できる. Defaults to None.
+            c2 (Union[float, Sequence[float]], optional):
+                群の最良に対する係数. 群ごとに指定できる. Defaults to None.
+            w (Union[float, Sequence[float]], optional):
+                慣性定数. 群ごとに指定できる. Defaults to None.
+            archive (EvaluationArchive, optional):
+                全ての群の評価結果の保存先. Noneの場合は保存しない. Defaults to None.
+        """
+        particle = ParticleSwarmOptimization.Particle
+        self.func: Function2D = func
+        self.archive: EvaluationArchive = archive
+        self.n: int = ParticleSwarmOptimization.N if n is None else n
+        self.c1: np.ndarray = SwarmBatch.per_swarm(
+            particle.C1 if c1 is None else c1, seeds
+        )
+        self.c2: np.ndarray = SwarmBatch.per_swarm(
+            particle.C2 if c2 is None else c2, seeds
+        )
+        self.w: np.ndarray = SwarmBatch.per_swarm(particle.W if w is None else w, seeds)
+
+        # 群ごとに独立した乱数を使うので、結果は一緒に動かす群によらない
+        self.generators: List[np.random.Generator] = [
+            np.random.default_rng(seed) for seed in seeds
+        ]
+        self.random: np.ndarray = np.empty((0, 2, len(seeds), self.n, 2))
+
+        # 定義域の下限と上限. 形は(2,)
+        self.low: np.ndarray = np.array([func.x_domain[0], func.y_domain[0]], float)
+        self.high: np.ndarray = np.array([func.x_domain[1], func.y_domain[1]], float)
+        self.point: np.ndarray = self.low + (self.high - self.low) * np.stack(
+            [generator.random((self.n, 2)) for generator in self.generators]
+        )
+        self.velocity: np.ndarray = np.stack(
+            [generator.random((self.n, 2)) for generator in self.generators]
+        )
+        self.my_best_point: np.ndarray = self.point.copy()
+        self.my_best_score: np.ndarray = self.evaluate()
+        if self.archive is not None:
+            self.archive.extend(
+                self.point[..., 0], self.point[..., 1], self.my_best_score
+            )
+        self.group_best_point: np.ndarray = np.empty((len(seeds), 2))
+        self.group_best_score: np.ndarray = np.full(len(seeds), float("inf"))
+
+    @staticmethod
+    def per_swarm(
+        value: Union[float, Sequence[float]], seeds: Sequence[int]
+    ) -> np.ndarray:
+        """
+        係数を群ごとの配列にする
+
+        Args:
+            value (Union[float, Sequence[float]]): 係数, もしくは群ごとの係数
+            seeds (Sequence[int]): 群ごとの乱数のシード
+
+        Returns:
+            np.ndarray: 形が(B, 1, 1)の配列
+        """
+        return np.broadcast_to(
+            np.asarray(value, dtype=np.float64), (len(seeds),)
+        ).reshape(-1, 1, 1)
+
+    def evaluate(self) -> np.ndarray:
+        """
+        全ての群の全ての粒子の現在の座標を評価する
+
+        Returns:
+            np.ndarray: 形が(B, N)の評価値
+        """
+        return self.func.evaluate(self.point[..., 0], self.point[..., 1])
+
+    def next_random(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        1回の移動に使う乱数を返す
+        群ごとの乱数はBLOCK回分をまとめて生成しておく
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 自身の最良と群の最良に対する乱数. 形は(B, N, 2)
+        """
+        if len(self.random) == 0:
+            self.random = np.stack(
+                [
+                    generator.random((SwarmBatch.BLOCK, 2, self.n, 2))
+                    for generator in self.generators
+                ],
+                axis=2,
+            )
+        random, self.random = self.random[0], self.random[1:]
+        return random[0], random[1]
+
+    def step(self) -> None:
+        """
+        全ての群を評価し、速度を更新して1回移動させる
+        """
+        score = self.evaluate()
+        if self.archive is not None:
+            self.archive.extend(self.point[..., 0], self.point[..., 1], score)
+        improved = score < self.my_best_score
+        self.my_best_score = np.where(improved, score, self.my_best_score)
+        self.my_best_point = np.where(
+            improved[..., np.newaxis], self.point, self.my_best_point
+        )
+
+        best = np.argmin(self.my_best_score, axis=1)
+        swarms = np.arange(len(best))
+        self.group_best_score = self.my_best_score[swarms, best]
+        self.group_best_point = self.my_best_point[swarms, best]
+
+        r1, r2 = self.next_random()
+        self.velocity = (
+            self.w * self.velocity
+            + self.c1 * r1 * (self.my_best_point - self.point)
+            + self.c2 * r2 * (self.group_best_point[:, np.newaxis, :] - self.point)
+        )
+        self.point = np.clip(self.point + self.velocity, self.low, self.high)
+
+    def learn(self, loop: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        全ての群を動かす
+
+        Args:
+            loop (int, optional):
+                移動回数. Noneの場合はParticleSwarmOptimization.LOOP. Defaults to None.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]:
+                群ごとの最良の座標(形は(B, 2))と最良値(形は(B,))
+        """
+        for _ in range(ParticleSwarmOptimization.LOOP if loop is None else loop):
+            self.step()
+        return self.group_best_point, self.group_best_score
@@ -12,7 +12,7 @@ https://qiita.com/tomitomi3/items/d4318bf7afbc1c835dda#bukin-function-n6
 
 
 __author__ = "Hidemasa Kondo (C.A.C.)"
-__date__ = "updated at 2021/08/30 (created at 2021/08/04)"
+__date__ = "updated at 2026/10/19 (created at 2021/08/04)"
 __version__ = "1.0.0"
 
 import sys
@@ -32,34 +32,40 @@ from tkinter import (
     Button,
     DISABLED,
     NORMAL,
+    filedialog,
     ttk,
 )
-from typing import Dict
+from typing import List, Tuple
 
 import numpy as np
 
-import matplotlib
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
+from convergence import DecimatedSeries
 from function_2d import Function2D
-from functions import TestFunctions
+from functions import FunctionRegistry
 from particle_swarm_optimization import ParticleSwarmOptimization
 
-matplotlib.use("tkagg")
-
 
 class Window2D:
     """
     Tkinterで表示を行うクラス
-    matplotlibで散布図を表示する
+    matplotlibで散布図を表示し、収束の様子のグラフはConvergencePanelで表示する
     """
 
+    GRAPH_INTERVAL: int = 50  # 収束の様子のグラフを更新する間隔(移動回数)
+
     def __init__(self) -> None:
         """
         コンストラクタ
         """
-        self.func: Function2D = Function2D()
+        # matplotlibの読み込みは重いため、ウィンドウを作るときまで遅らせる
+        # pylint: disable=import-outside-toplevel
+        import matplotlib
+
+        matplotlib.use("tkagg")
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.func: Function2D = FunctionRegistry.get("tmp")
         self.pso: ParticleSwarmOptimization = ParticleSwarmOptimization(self.func)
 
         self.x_point = np.empty((0, self.pso.N))
@@ -73,8 +79,10 @@ class Window2D:
 
         self.contour = None
 
-        self.figure: plt.Figure = plt.Figure()
-        self.axes: plt.axes = self.figure.add_subplot(111)
+        self.figure: Figure = Figure()
+        self.axes = self.figure.add_subplot(111)
+
+        self.convergence_panel: ConvergencePanel = ConvergencePanel(self.root)
 
         self.setting_menu: SettingMenu = SettingMenu(self.root, self)
         self.setting_menu.set_menubar()
@@ -89,6 +97,7 @@ class Window2D:
         # widgetの配置
         self.frame_plt.grid(row=0, column=0)
         self.frame_scale.grid(row=1, column=0)
+        self.convergence_panel.frame.grid(row=0, column=1)
         self.canvas.get_tk_widget().grid(row=1, column=0)
 
     def append_scatter_data(self, x_point, y_point) -> None:
@@ -109,10 +118,11 @@ class Window2D:
         self.x_point = np.empty((0, self.pso.N))
         self.y_point = np.empty((0, self.pso.N))
 
-        plt.xlim(self.func.x_domain[0], self.func.x_domain[1])
-        plt.ylim(self.func.y_domain[0], self.func.y_domain[1])
+        self.axes.set_xlim(self.func.x_domain[0], self.func.x_domain[1])
+        self.axes.set_ylim(self.func.y_domain[0], self.func.y_domain[1])
 
         self.scale_var = DoubleVar()
+        self.convergence_panel.reset()
         self.pso.reset()
 
     def set_func(self, func: Function2D) -> None:
@@ -129,9 +139,14 @@ class Window2D:
     def learn(self) -> None:
         """
         群を学習させる
+        学習の途中でも一定の間隔で収束の様子のグラフを更新する
         """
-        for data in self.pso.learn():
+        for number, data in enumerate(self.pso.learn_iter(), 1):
             self.append_scatter_data(*data)
+            self.convergence_panel.append(self.pso.statistics())
+            if number % Window2D.GRAPH_INTERVAL == 0:
+                self.convergence_panel.update_graph()
+        self.convergence_panel.update_graph()
 
     @staticmethod
     def init_root() -> Tk:
@@ -143,7 +158,7 @@ class Window2D:
         """
         a_tk = Tk()
         a_tk.title("Plot window")
-        a_tk.geometry("640x520")
+        a_tk.geometry("1280x520")
         return a_tk
 
     def on_closing(self) -> None:
@@ -204,21 +219,7 @@ class Window2D:
         """
         等高線を作成する
         """
-        # データ作成
-        x = np.arange(self.func.x_domain[0], self.func.x_domain[1] + 0.000001, 0.1)
-        y = np.arange(self.func.y_domain[0], self.func.y_domain[1] + 0.000001, 0.1)
-        x_mesh, y_mesh = np.meshgrid(x, y)
-        z = np.array(
-            [
-                np.array(
-                    list(
-                        map(lambda x: self.func(x[0], x[1]), zip(x_mesh[i], y_mesh[i]))
-                    )
-                )
-                for i in range(len(x_mesh))
-            ]
-        )
-        self.contour = [x_mesh, y_mesh, z]
+        self.contour = self.func.contour()
 
     def draw_controurf(self) -> None:
         """
@@ -234,20 +235,81 @@ class Window2D:
         self.root.mainloop()
 
 
+class ConvergencePanel:
+    """
+    収束の様子(群の最良値, 粒子それぞれの最良値の平均, 粒子の広がり)のグラフを表示するクラス
+    履歴は間引いて保持するので、繰り返し回数が増えても描画の負担は一定になる
+    """
+
+    def __init__(self, root: Tk, buckets: int = 500) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            root (Tk): tkオブジェクト
+            buckets (int, optional): それぞれの履歴で保持する区間の最小数. Defaults to 500.
+        """
+        # pylint: disable=import-outside-toplevel
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.buckets: int = buckets
+        self.frame: Frame = Frame(root)
+        self.figure: Figure = Figure()
+        score_axes = self.figure.add_subplot(211)
+        spread_axes = self.figure.add_subplot(212)
+        self.axes = (score_axes, spread_axes)
+        # statisticsの返り値の順に、履歴とそれを描く線を対応させる
+        self.lines = (
+            score_axes.plot([], [], label="group best")[0],
+            score_axes.plot([], [], label="mean of my best")[0],
+            spread_axes.plot([], [], c="orange", label="spread")[0],
+        )
+        self.series: List[DecimatedSeries] = []
+        self.reset()
+        score_axes.legend(loc="upper right")
+        spread_axes.legend(loc="upper right")
+        spread_axes.set_xlabel("iteration")
+
+        self.canvas = FigureCanvasTkAgg(self.figure, self.frame)
+        self.canvas.get_tk_widget().grid(row=1, column=0)
+
+    def reset(self) -> None:
+        """
+        履歴を初期化する
+        """
+        self.series = [DecimatedSeries(self.buckets) for _ in self.lines]
+
+    def append(self, statistics: Tuple[float, float, float]) -> None:
+        """
+        1回分の値を履歴に追加する
+
+        Args:
+            statistics (Tuple[float, float, float]):
+                ParticleSwarmOptimization.statisticsの返り値
+        """
+        for series, value in zip(self.series, statistics):
+            series.append(value)
+
+    def update_graph(self) -> None:
+        """
+        収束の様子のグラフを更新する
+        線のデータだけを差し替えるので、描画の負担は繰り返し回数によらない
+        """
+        for line, series in zip(self.lines, self.series):
+            line.set_data(*series.line())
+        for axes in self.axes:
+            axes.relim()
+            axes.autoscale_view()
+        self.canvas.draw()
+        self.canvas.flush_events()
+
+
 class SettingMenu:
     """
     メニューバーを表示するクラス
     """
 
-    func_dict: Dict[str, Function2D] = {
-        "tmp": Function2D(),
-        "Ackley Function": TestFunctions.ackley_function(),
-        "Rosenbrock Function": TestFunctions.rosenbrock_function(),
-        "Bukin function N.6": TestFunctions.bukin_function_n6(),
-        "Levi function N.13": TestFunctions.levi_function_n13(),
-        "Easom function": TestFunctions.easom_function(),
-    }
-
     window_exist: bool = False
 
     def __init__(self, root: Tk, window2d: Window2D) -> None:
@@ -274,6 +336,28 @@ class SettingMenu:
         menu_file = Menu(self.root)
         self.menubar.add_cascade(label="PSO設定", menu=menu_file)
         menu_file.add_command(label="PSO設定", command=self.display_window)
+        menu_file.add_command(label="動画を保存", command=self.save_animation)
+
+    def save_animation(self) -> None:
+        """
+        現在の散布図の時系列を動画として保存する
+        """
+        # pylint: disable=import-outside-toplevel
+        from animation_exporter import AnimationExporter
+
+        path = filedialog.asksaveasfilename(
+            defaultextension=".gif",
+            filetypes=[("GIF", "*.gif"), ("MP4", "*.mp4")],
+        )
+        if not path:
+            return
+        exporter = AnimationExporter(
+            self.window2d.func, self.window2d.x_point, self.window2d.y_point
+        )
+        try:
+            exporter.export(path)
+        except RuntimeError as error:
+            messagebox.showerror("Error", str(error))
 
     @staticmethod
     def init_root() -> Tk:
@@ -316,10 +400,11 @@ class SettingMenu:
         input_w = DoubleVar(value=ParticleSwarmOptimization.Particle.W)
         SettingMenu.input_setting(frame, input_w, "W: これまでの速度に対する重み", 4)
 
+        func_names = FunctionRegistry.names()
         combobox_func = ttk.Combobox(
             frame_center,
-            height=len(SettingMenu.func_dict),
-            values=tuple(SettingMenu.func_dict.keys()),
+            height=len(func_names),
+            values=tuple(func_names),
             state="readonly",
         )
         combobox_func.grid(row=0, column=0, sticky="NESW")
@@ -381,10 +466,10 @@ class SettingMenu:
             w (float, optional): W. Defaults to None.
         """
         self.button_ok["state"] = DISABLED
-        if func in SettingMenu.func_dict:
+        if func in FunctionRegistry.names():
             self.now_func = func
         self.window2d.pso.set_status(n=n, loop=loop, c1=c1, c2=c2, w=w)
-        self.window2d.set_func(SettingMenu.func_dict[self.now_func])
+        self.window2d.set_func(FunctionRegistry.get(self.now_func))
         self.window2d.reset()
         self.window2d.learn()
         self.button_ok["state"] = NORMAL